@@ -7,18 +7,32 @@ This script:
   2) Identifies any spectral window whose frequency range contains
      at least one SiO(v=0) transition from J=1–0 to J=20–19.
   3) Produces:
-        - sio_spw_matches.csv / .tex      (per SPW)
-        - sio_mous_summary.csv / .tex     (per MOUS)
+        - sio_spw_matches.parquet / .csv / .tex      (per SPW)
+        - sio_mous_summary.parquet / .csv / .tex     (per MOUS)
   4) Optional: downloads all public SiO-covering MOUS IDs
      using astroquery.alma.
 """
 
 from __future__ import annotations
-from typing import List, Dict
+import csv
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
 import pandas as pd
 import alminer
+import pyvo
+from astropy import units as u
+from astropy.coordinates import SkyCoord
 from astroquery.alma import Alma
 
+try:                           # optional: JIT-compiled matching kernel
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 
 # --------------------------------------------------------------------
 # 1. User configuration, add list of sources in the MAP Project 
@@ -26,72 +40,210 @@ from astroquery.alma import Alma
 
 MAPS_SOURCES = ["IM Lup", "AS 209", "GM Aur", "HD 163296", "MWC 480"]
 
-# SiO(v=0) transitions in GHz used for the search 
-SIO_V0_TRANSITIONS_GHZ: Dict[str, float] = {
-    "J=1-0":   43.423864,
-    "J=2-1":   86.846960,
-    "J=3-2":  130.268610,
-    "J=4-3":  173.688310,
-    "J=5-4":  217.104980,
-    "J=6-5":  260.518200,
-    "J=7-6":  303.927030,
-    "J=8-7":  347.331000,
-    "J=9-8":  390.728730,
-    "J=10-9": 434.120450,
-    "J=11-10":477.506120,
-    "J=12-11":520.885480,
-    "J=13-12":564.258560,
-    "J=14-13":607.625260,
-    "J=15-14":650.985560,
-    "J=16-15":694.339440,
-    "J=17-16":737.686780,
-    "J=18-17":781.027470,
-    "J=19-18":824.361490,
-    "J=20-19":867.688720,
-}
+# SiO(v=0) transitions in GHz used for the search (read-only structured
+# array: the matching code reads the "freq" / "name" fields directly)
+SIO_TABLE = np.array(
+    [
+        ("J=1-0",    43.423864),
+        ("J=2-1",    86.846960),
+        ("J=3-2",   130.268610),
+        ("J=4-3",   173.688310),
+        ("J=5-4",   217.104980),
+        ("J=6-5",   260.518200),
+        ("J=7-6",   303.927030),
+        ("J=8-7",   347.331000),
+        ("J=9-8",   390.728730),
+        ("J=10-9",  434.120450),
+        ("J=11-10", 477.506120),
+        ("J=12-11", 520.885480),
+        ("J=13-12", 564.258560),
+        ("J=14-13", 607.625260),
+        ("J=15-14", 650.985560),
+        ("J=16-15", 694.339440),
+        ("J=17-16", 737.686780),
+        ("J=18-17", 781.027470),
+        ("J=19-18", 824.361490),
+        ("J=20-19", 867.688720),
+    ],
+    dtype=[("name", "U8"), ("freq", "f8")],
+)
+SIO_TABLE.flags.writeable = False
 
 TAP_SERVICE = "ESO"          # ESO mirror is most reliable than ALMA 
 SEARCH_RADIUS_ARCMIN = 1.0   # Cone-search radius
+USE_DIRECT_TAP = True        # Project columns server-side instead of ALminer.target()
 DO_DOWNLOAD = False          # Set to True to download MOUS datasets
+MAX_QUERY_WORKERS = 8        # Concurrent archive queries (network-bound)
+USE_NUMBA_KERNEL = False     # JIT matching kernel; only pays off on very large archives
+QUERY_CACHE_DIR = Path(".cache")  # On-disk parquet cache of query results
+QUERY_CACHE_TTL_HOURS = 24.0      # Re-query once a cache file is older than this
+MAX_DOWNLOAD_WORKERS = 6     # Parallel MOUS download streams
+DOWNLOAD_DIR: Optional[Path] = None  # None = astroquery's default cache location
+OUTPUT_BUFFER_BYTES = 1 << 20  # Write buffer for text output tables
+
+# ALMA TAP endpoints behind the TAP_SERVICE names ALminer accepts
+TAP_URLS = {
+    "ESO":  "https://almascience.eso.org/tap",
+    "NRAO": "https://almascience.nrao.edu/tap",
+    "NAOJ": "https://almascience.nao.ac.jp/tap",
+}
+
+# ObsCore columns used downstream (including fallbacks read by
+# harmonize_columns); everything else is dropped right after the query.
+OBSCORE_COLUMNS = [
+    "Source", "project_code", "band_list", "band",
+    "min_freq_GHz", "max_freq_GHz",
+    "ang_res_arcsec", "best_ang_res",
+    "member_ous_uid", "member_ous_id",
+]
 
 
 # --------------------------------------------------------------------
 # 2. Query ALMA Archive (public only) for ALL MAPS sources
 # --------------------------------------------------------------------
 
+def _cache_path(src: str) -> Path:
+    """
+    Parquet cache file for one source. The key covers the cone-search
+    parameters, the backend and its query definition (ADQL text and
+    rounding for the TAP path) and the stored column set, so editing any
+    of them invalidates the cache instead of serving stale rows.
+    """
+    if USE_DIRECT_TAP:
+        backend = f"tap|{_OBSCORE_QUERY}|{sorted(_TAP_ROUNDING.items())}"
+    else:
+        backend = "alminer"
+    key = "|".join([
+        src, str(SEARCH_RADIUS_ARCMIN), TAP_SERVICE, backend,
+        ",".join(OBSCORE_COLUMNS),
+    ])
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return QUERY_CACHE_DIR / f"{digest}.parquet"
+
+
+def _load_cached(src: str) -> Optional[pd.DataFrame]:
+    """Return the cached query result for src, or None if missing or stale."""
+    path = _cache_path(src)
+    if not path.exists():
+        return None
+    age_s = time.time() - path.stat().st_mtime
+    if age_s > QUERY_CACHE_TTL_HOURS * 3600:
+        return None
+    try:
+        df = pd.read_parquet(path)
+    except Exception as exc:
+        print(f"  Ignoring unreadable cache for {src}: {exc}")
+        return None
+    print(f"\n=== Using cached ALMA results for: {src} ({len(df)} rows) ===")
+    return df
+
+
+def _store_cached(src: str, df: pd.DataFrame) -> None:
+    """Write a query result to the parquet cache; failures are non-fatal."""
+    path = _cache_path(src)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, compression="zstd", index=False)
+    except Exception as exc:
+        print(f"  Could not cache results for {src}: {exc}")
+
+
+_OBSCORE_QUERY = """
+SELECT proposal_id AS project_code,
+       band_list,
+       member_ous_uid,
+       s_resolution AS ang_res_arcsec,
+       299792458.0 / em_max / 1e9 AS "min_freq_GHz",
+       299792458.0 / em_min / 1e9 AS "max_freq_GHz"
+FROM ivoa.obscore
+WHERE INTERSECTS(CIRCLE('ICRS', {ra:.8f}, {dec:.8f}, {radius_deg:.8f}), s_region) = 1
+  AND data_rights = 'Public'
+"""
+
+# Same rounding as ALminer.filter_results()
+_TAP_ROUNDING = {"min_freq_GHz": 2, "max_freq_GHz": 2, "ang_res_arcsec": 3}
+
+
+def _tap_query(src: str) -> pd.DataFrame:
+    """
+    Cone search around src directly on the ALMA ObsCore TAP service,
+    selecting (and deriving, in ADQL) only the columns the pipeline uses
+    so the server never sends the other ~50 ObsCore columns. Values are
+    rounded the way ALminer.filter_results() does, so both backends give
+    identical frames.
+    """
+    coord = SkyCoord.from_name(src)
+    query = _OBSCORE_QUERY.format(
+        ra=coord.icrs.ra.deg,
+        dec=coord.icrs.dec.deg,
+        radius_deg=(SEARCH_RADIUS_ARCMIN * u.arcmin).to_value(u.deg),
+    )
+    service = pyvo.dal.TAPService(TAP_URLS[TAP_SERVICE])
+    df = service.search(query).to_table().to_pandas()
+    return df.round(_TAP_ROUNDING)
+
+
+def _alminer_query(src: str) -> pd.DataFrame:
+    return alminer.target(
+        [src],
+        search_radius=SEARCH_RADIUS_ARCMIN,
+        tap_service=TAP_SERVICE,
+        point=False,          # cone search
+        public=True,          # public data only
+        published=None,       # both published and unpublished
+        print_query=False,
+        print_targets=True,
+    )
+
+
+def _prune_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep only the ObsCore columns the pipeline actually uses."""
+    return df[[c for c in OBSCORE_COLUMNS if c in df.columns]]
+
+
+def _query_one(src: str) -> Optional[pd.DataFrame]:
+    """
+    Query a single MAPS source (direct TAP query or ALminer.target()), tag
+    every returned row with the source name and prune it to the columns
+    the pipeline uses before caching it. Returns None if the query fails
+    or is empty.
+    """
+    print(f"\n=== Querying ALMA archive for: {src} ===")
+    try:
+        df = _tap_query(src) if USE_DIRECT_TAP else _alminer_query(src)
+    except Exception as exc:
+        print(f"  Query failed for {src}: {exc}")
+        return None
+
+    if df is None or len(df) == 0:
+        print(f"  No ObsCore rows returned for {src}.")
+        return None
+
+    df = df.copy()
+    # Tag everything returned in this query with the MAPS source name
+    df["Source"] = src
+    df = _prune_columns(df)
+    _store_cached(src, df)
+    return df
+
+
 def query_maps_sources(sources: List[str]) -> pd.DataFrame:
     """
-    Loop over MAPS sources and query each one with ALminer.target().
-    Explicitly tag each row with the MAPS source name in a 'Source' column.
+    Query all MAPS sources concurrently (one TAP request per source).
+    Sources with a fresh parquet cache are not re-queried. The queries are
+    network-bound, so threads overlap the waits; results are combined in
+    the original source order.
     """
-    all_obs = []
-
-    for src in sources:
-        print(f"\n=== Querying ALMA archive for: {src} ===")
-        try:
-            df = alminer.target(
-                [src],
-                search_radius=SEARCH_RADIUS_ARCMIN,
-                tap_service=TAP_SERVICE,
-                point=False,          # cone search
-                public=True,          # public data only
-                published=None,       # both published and unpublished
-                print_query=False,
-                print_targets=True,
-            )
-        except Exception as exc:
-            print(f"  Query failed for {src}: {exc}")
-            continue
-
-        if df is None or len(df) == 0:
-            print(f"  No ObsCore rows returned for {src}.")
-            continue
-
-        df = df.copy()
-        # Tag everything returned in this query with the MAPS source name
-        df["Source"] = src
-        all_obs.append(df)
+    results = {src: _load_cached(src) for src in sources}
+    missing = [src for src, df in results.items() if df is None]
+
+    if missing:
+        n_workers = max(1, min(MAX_QUERY_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=n_workers) as ex:
+            results.update(zip(missing, ex.map(_query_one, missing)))
 
+    # Both fresh and cached frames are already pruned to OBSCORE_COLUMNS
+    all_obs = [results[src] for src in sources if results[src] is not None]
     if not all_obs:
         raise RuntimeError("No observations returned for any MAPS source.")
 
@@ -109,57 +261,148 @@ def query_maps_sources(sources: List[str]) -> pd.DataFrame:
 # --------------------------------------------------------------------
 
 def harmonize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    """
+    Add the standardized ang_res_arcsec / band_list / MOUS_ID columns.
+    Existing columns are only read, so everything is added in a single
+    assign() instead of deep-copying the full ObsCore table first.
+    Identifiers are stored as categories.
+    """
+    # Frequency columns
+    for col in ("min_freq_GHz", "max_freq_GHz"):
+        if col not in df.columns:
+            raise KeyError(f"Missing required ObsCore column: {col}")
+
+    derived = {}
 
     # Angular resolution
     if "ang_res_arcsec" not in df.columns:
         if "best_ang_res" in df.columns:
-            df["ang_res_arcsec"] = df["best_ang_res"]
+            derived["ang_res_arcsec"] = df["best_ang_res"]
         else:
-            df["ang_res_arcsec"] = float("nan")
+            derived["ang_res_arcsec"] = np.nan
 
     # Band column
     if "band_list" not in df.columns and "band" in df.columns:
-        df["band_list"] = df["band"]
-
-    # Frequency columns
-    for col in ("min_freq_GHz", "max_freq_GHz"):
-        if col not in df.columns:
-            raise KeyError(f"Missing required ObsCore column: {col}")
+        derived["band_list"] = df["band"]
 
     # MOUS ID
     if "member_ous_uid" in df.columns:
-        df["MOUS_ID"] = df["member_ous_uid"]
+        derived["MOUS_ID"] = df["member_ous_uid"]
     elif "member_ous_id" in df.columns:
-        df["MOUS_ID"] = df["member_ous_id"]
+        derived["MOUS_ID"] = df["member_ous_id"]
     else:
         raise KeyError(
             "ObsCore table missing MOUS identifier (member_ous_uid / member_ous_id)."
         )
 
-    return df
+    df = df.assign(**derived)
+
+    # Repeated string identifiers become integer-coded categories
+    narrow = {
+        col: "category"
+        for col in ("MOUS_ID", "project_code", "Source", "band_list")
+        if col in df.columns
+    }
+
+    return df.astype(narrow)
+
+
+def drop_duplicate_spws(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Drop rows repeated across execution blocks. Rows are compared on every
+    column the output tables use, so distinct SPW rows and MOUS aggregates
+    are unchanged; only exact repeats are removed before matching.
+    """
+    subset = [
+        c for c in ("MOUS_ID", "Source", "project_code", "band_list",
+                    "min_freq_GHz", "max_freq_GHz", "ang_res_arcsec")
+        if c in df.columns
+    ]
+    deduped = df.drop_duplicates(subset=subset, ignore_index=True)
+    print(f"\nUnique SPW rows after de-duplication: {len(deduped)} "
+          f"(dropped {len(df) - len(deduped)})")
+    return deduped
 
 
 # --------------------------------------------------------------------
 # 4. Frequency filtering for SiO(v=0)
 # --------------------------------------------------------------------
 
-def find_sio_spw_matches(obs_df: pd.DataFrame) -> pd.DataFrame:
-    matches = []
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _match_kernel(mn, mx, nu):
+        """
+        (row, transition) index pairs with mn[row] < nu[j] < mx[row],
+        ordered by transition and then by row. Numba has no atomics, so
+        hits per transition are counted in a first parallel pass and
+        written at their prefix-sum offsets in a second one.
+        """
+        n, m = len(mn), len(nu)
+        counts = np.zeros(m, dtype=np.int64)
+        for j in prange(m):
+            c = 0
+            for i in range(n):
+                if mn[i] < nu[j] and mx[i] > nu[j]:
+                    c += 1
+            counts[j] = c
+
+        offsets = np.zeros(m + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        out_row = np.empty(offsets[m], dtype=np.int64)
+        out_col = np.empty(offsets[m], dtype=np.int64)
+        for j in prange(m):
+            k = offsets[j]
+            for i in range(n):
+                if mn[i] < nu[j] and mx[i] > nu[j]:
+                    out_row[k] = i
+                    out_col[k] = j
+                    k += 1
+        return out_row, out_col
+
+
+def _match_indices(mn: np.ndarray, mx: np.ndarray):
+    """
+    Row / transition index pairs of every SPW strictly containing a SiO
+    line, ordered by transition and then by row. SPWs are sorted once by
+    min_freq_GHz so a binary search bounds the candidates (min < nu),
+    which are then filtered on max > nu. With USE_NUMBA_KERNEL (and numba
+    installed) the JIT kernel is used instead.
+    """
+    if USE_NUMBA_KERNEL and njit is not None:
+        return _match_kernel(mn, mx, SIO_TABLE["freq"])
+
+    order = np.argsort(mn, kind="stable")
+    mn_sorted = mn[order]
+    mx_sorted = mx[order]
+    upper = np.searchsorted(mn_sorted, SIO_TABLE["freq"], side="left")
 
-    for trans, nu in SIO_V0_TRANSITIONS_GHZ.items():
-        mask = (obs_df["min_freq_GHz"] < nu) & (obs_df["max_freq_GHz"] > nu)
-        sel = obs_df[mask].copy()
-        if len(sel):
-            sel["SiO_transition"] = trans
-            sel["SiO_freq_GHz"] = nu
-            matches.append(sel)
+    row_parts, col_parts = [], []
+    for j, hi in enumerate(upper):
+        cand = np.nonzero(mx_sorted[:hi] > SIO_TABLE["freq"][j])[0]
+        # Restore original row order within each transition
+        row_parts.append(np.sort(order[cand]))
+        col_parts.append(np.full(len(cand), j))
+
+    return np.concatenate(row_parts), np.concatenate(col_parts)
+
+
+def find_sio_spw_matches(obs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    For each SiO transition, find the SPWs whose frequency range strictly
+    contains it, and tag the matching rows with the transition.
+    """
+    mn = obs_df["min_freq_GHz"].to_numpy()
+    mx = obs_df["max_freq_GHz"].to_numpy()
 
-    if not matches:
+    rows, cols = _match_indices(mn, mx)
+    if len(rows) == 0:
         print("No SPWs cover any SiO(v=0) lines.")
         return pd.DataFrame()
 
-    all_matches = pd.concat(matches, ignore_index=True)
+    all_matches = obs_df.iloc[rows].reset_index(drop=True)
+    all_matches["SiO_transition"] = SIO_TABLE["name"][cols]
+    all_matches["SiO_freq_GHz"] = SIO_TABLE["freq"][cols]
+
     print(f"\nTotal SiO-covering SPW rows: {len(all_matches)}")
 
     # Quick check: how many SiO SPWs per MAPS source?
@@ -174,43 +417,82 @@ def find_sio_spw_matches(obs_df: pd.DataFrame) -> pd.DataFrame:
 # --------------------------------------------------------------------
 
 def build_per_spw_table(df: pd.DataFrame) -> pd.DataFrame:
-    keep_cols = [
-        "Source", "project_code", "band_list",
-        "min_freq_GHz", "max_freq_GHz",
-        "SiO_transition", "SiO_freq_GHz",
-        "ang_res_arcsec", "MOUS_ID",
-    ]
-    keep_cols = [c for c in keep_cols if c in df.columns]
-
-    spw = df[keep_cols].rename(columns={
-        "project_code": "Project",
-        "band_list": "ALMA_Band",
-    })
+    """
+    Per-SPW output table. Built straight from the existing column arrays
+    (numeric columns shared without copying, categoricals kept as codes)
+    rather than through a column selection plus rename.
+    """
+    out_cols = {
+        "Source": "Source",
+        "Project": "project_code",
+        "ALMA_Band": "band_list",
+        "min_freq_GHz": "min_freq_GHz",
+        "max_freq_GHz": "max_freq_GHz",
+        "SiO_transition": "SiO_transition",
+        "SiO_freq_GHz": "SiO_freq_GHz",
+        "ang_res_arcsec": "ang_res_arcsec",
+        "MOUS_ID": "MOUS_ID",
+    }
+    spw = pd.DataFrame(
+        {name: df[col].array
+         for name, col in out_cols.items() if col in df.columns},
+        copy=False,
+    )
 
-    return spw.sort_values(
-        ["Source", "Project", "ALMA_Band", "SiO_freq_GHz"]
+    spw.sort_values(
+        ["Source", "Project", "ALMA_Band", "SiO_freq_GHz"],
+        kind="stable", ignore_index=True, inplace=True,
     )
+    return spw
 
 
 def build_per_mous_table(df: pd.DataFrame) -> pd.DataFrame:
     def join_unique(series):
-        return ", ".join(sorted(series.astype(str).unique()))
-
-    grouped = (
-        df.groupby("MOUS_ID")
-          .agg({
-              "Source": join_unique,
-              "project_code": join_unique,
-              "band_list": join_unique,
-              "min_freq_GHz": "min",
-              "max_freq_GHz": "max",
-              "SiO_transition": join_unique,
-              "SiO_freq_GHz": join_unique,
-              "ang_res_arcsec": "min",
-          })
-          .reset_index()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Look distinct codes up in the categories: no per-row strings
+            codes = np.unique(series.cat.codes)
+            vals = series.cat.categories[codes[codes >= 0]].tolist()
+            if len(codes) and codes[0] < 0:
+                vals.append("nan")
+        else:
+            vals = series.unique()
+        return ", ".join(sorted(map(str, vals)))
+
+    # Group on integer category codes rather than hashing long UID strings
+    str_cols = ("MOUS_ID", "Source", "project_code", "band_list", "SiO_transition")
+    df = df.astype({c: "category" for c in str_cols})
+
+    # Sort once so each MOUS occupies a contiguous block; groups then come
+    # out in MOUS_ID order without groupby having to sort the keys again.
+    df = df.sort_values("MOUS_ID", kind="stable")
+
+    # Numeric summaries: named aggregation with built-in reducers only,
+    # so pandas stays on its cythonized groupby path.
+    numeric = df.groupby("MOUS_ID", observed=True, sort=False).agg(
+        min_freq_GHz=("min_freq_GHz", "min"),
+        max_freq_GHz=("max_freq_GHz", "max"),
+        ang_res_arcsec=("ang_res_arcsec", "min"),
     )
 
+    # String summaries in a separate pass: de-duplicate (MOUS_ID, value)
+    # pairs first so the Python-level join sees each value once per MOUS.
+    strings = pd.DataFrame({
+        col: (
+            df[["MOUS_ID", col]].drop_duplicates()
+              .groupby("MOUS_ID", observed=True, sort=False)[col]
+              .agg(join_unique)
+        )
+        for col in ("Source", "project_code", "band_list",
+                    "SiO_transition", "SiO_freq_GHz")
+    })
+
+    grouped = numeric.join(strings).reset_index()[[
+        "MOUS_ID", "Source", "project_code", "band_list",
+        "min_freq_GHz", "max_freq_GHz",
+        "SiO_transition", "SiO_freq_GHz",
+        "ang_res_arcsec",
+    ]]
+
     grouped = grouped.rename(columns={
         "project_code": "Project",
         "band_list": "ALMA_Band",
@@ -226,36 +508,80 @@ def build_per_mous_table(df: pd.DataFrame) -> pd.DataFrame:
 # 6. Save all output tables
 # --------------------------------------------------------------------
 
+def _csv_cells(series: pd.Series) -> list:
+    """Column values as CSV cells, formatted the way DataFrame.to_csv does."""
+    missing = series.isna().to_numpy()
+    if series.dtype.kind == "f":
+        cells = series.to_numpy().astype(str)   # shortest repr, e.g. 217.06
+        cells[missing] = ""
+        return cells.tolist()
+    cells = series.to_numpy(dtype=object, copy=True)
+    cells[missing] = ""
+    return cells.tolist()
+
+
+def write_csv_fast(df: pd.DataFrame, path: str) -> None:
+    """
+    Write df as CSV (no index) by formatting each column in one vectorized
+    pass and handing the rows to the C csv writer, instead of going
+    through to_csv's generic per-cell formatting path.
+    """
+    columns = [_csv_cells(df[c]) for c in df.columns]
+    with open(path, "w", newline="", buffering=OUTPUT_BUFFER_BYTES) as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(df.columns)
+        writer.writerows(zip(*columns))
+
+
+def _plain_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast categorical columns to plain strings. The categories come from the
+    full ObsCore query, so they would otherwise carry every unmatched ID
+    into the outputs and give the two tables different schemas.
+    """
+    cats = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: str for c in cats})
+
+
 def save_tables(spw: pd.DataFrame, mous: pd.DataFrame) -> None:
-    spw.to_csv("sio_spw_matches.csv", index=False)
-    mous.to_csv("sio_mous_summary.csv", index=False)
-
-    with open("sio_spw_matches.tex", "w") as f:
-        f.write(
-            spw.to_latex(
-                index=False,
-                float_format="%.6f",
-                columns=[
-                    "Source", "Project", "ALMA_Band",
-                    "min_freq_GHz", "max_freq_GHz",
-                    "SiO_transition", "SiO_freq_GHz",
-                    "ang_res_arcsec"
-                ]
-            )
+    spw = _plain_columns(spw)
+    mous = _plain_columns(mous)
+
+    # Parquet is the canonical machine-readable output; CSV/LaTeX are for
+    # human inspection.
+    try:
+        spw.to_parquet("sio_spw_matches.parquet", compression="zstd", index=False)
+        mous.to_parquet("sio_mous_summary.parquet", compression="zstd", index=False)
+    except ImportError as exc:
+        print(f"  Skipping parquet output ({exc})")
+
+    write_csv_fast(spw, "sio_spw_matches.csv")
+    write_csv_fast(mous, "sio_mous_summary.csv")
+
+    with open("sio_spw_matches.tex", "w", buffering=OUTPUT_BUFFER_BYTES) as f:
+        spw.to_latex(
+            buf=f,
+            index=False,
+            float_format="%.6f",
+            columns=[
+                "Source", "Project", "ALMA_Band",
+                "min_freq_GHz", "max_freq_GHz",
+                "SiO_transition", "SiO_freq_GHz",
+                "ang_res_arcsec"
+            ]
         )
 
-    with open("sio_mous_summary.tex", "w") as f:
-        f.write(
-            mous.to_latex(
-                index=False,
-                float_format="%.6f",
-                columns=[
-                    "MOUS_ID", "Source", "Project", "ALMA_Band",
-                    "SiO_transitions", "SiO_freqs_GHz",
-                    "min_freq_GHz", "max_freq_GHz",
-                    "ang_res_arcsec"
-                ]
-            )
+    with open("sio_mous_summary.tex", "w", buffering=OUTPUT_BUFFER_BYTES) as f:
+        mous.to_latex(
+            buf=f,
+            index=False,
+            float_format="%.6f",
+            columns=[
+                "MOUS_ID", "Source", "Project", "ALMA_Band",
+                "SiO_transitions", "SiO_freqs_GHz",
+                "min_freq_GHz", "max_freq_GHz",
+                "ang_res_arcsec"
+            ]
         )
 
     print("\nSaved: sio_spw_matches.*, sio_mous_summary.*")
@@ -265,18 +591,39 @@ def save_tables(spw: pd.DataFrame, mous: pd.DataFrame) -> None:
 # 7. Optional: Download SiO-covering MOUS IDs
 # --------------------------------------------------------------------
 
-def download_mous_products(mous_table: pd.DataFrame) -> None:
+def _fetch_mous(uid: str):
+    """Retrieve one MOUS with its own Alma() instance (one per worker call)."""
+    print(f"Retrieving {uid} ...")
     alma = Alma()     # public access only
+    if DOWNLOAD_DIR is not None:
+        alma.cache_location = DOWNLOAD_DIR
+    return alma.retrieve_data_from_uid(uid, cache=True)
+
+
+def download_mous_products(mous_table: pd.DataFrame) -> None:
+    """
+    Download all MOUS datasets, overlapping several transfers at once.
+    Downloads are bound by per-connection throughput, so each worker
+    uses an independent Alma() session.
+    """
     uids = mous_table["MOUS_ID"].unique()
 
     print(f"\nDownloading {len(uids)} public MOUS datasets...\n")
+    if len(uids) == 0:
+        return
+
+    n_workers = min(MAX_DOWNLOAD_WORKERS, len(uids))
+    with ThreadPoolExecutor(max_workers=n_workers) as ex:
+        futures = {ex.submit(_fetch_mous, uid): uid for uid in uids}
 
-    for uid in uids:
-        print(f"Retrieving {uid} ...")
-        try:
-            alma.retrieve_data_from_uid(uid, cache=True)
-        except Exception as exc:
-            print(f"  Failed to download {uid}: {exc}")
+        for fut in as_completed(futures):
+            uid = futures[fut]
+            try:
+                fut.result()
+            except Exception as exc:
+                print(f"  Failed to download {uid}: {exc}")
+            else:
+                print(f"  Done: {uid}")
 
 
 # --------------------------------------------------------------------
@@ -288,6 +635,7 @@ def main():
 
     obs = query_maps_sources(MAPS_SOURCES)
     obs = harmonize_columns(obs)
+    obs = drop_duplicate_spws(obs)
 
     sio_spw = find_sio_spw_matches(obs)
     if sio_spw.empty: